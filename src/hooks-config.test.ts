@@ -1,9 +1,15 @@
-import { describe, it, expect, vi, beforeEach } from "vitest";
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
 import {
   buildHooksConfig,
   mergeHooksIntoSettings,
   getClaudeSettingsPath,
   getHooksDir,
+  getIndexRootsPath,
+  getIndexStatusPath,
+  indexStatusSignature,
+  markProjectIndexed,
+  readIndexStatus,
+  writeIndexStatus,
   ClaudeHooksConfig,
   CLAUDE_ENFORCEMENT_CRITICAL_HOOKS,
   CURSOR_ENFORCEMENT_CRITICAL_HOOKS,
@@ -286,6 +292,57 @@ describe("hooks-config", () => {
     });
   });
 
+  describe("getIndexRootsPath", () => {
+    it("should sit next to the index status file", () => {
+      expect(path.dirname(getIndexRootsPath())).toBe(path.dirname(getIndexStatusPath()));
+    });
+  });
+
+  describe("writeIndexStatus", () => {
+    let home: string;
+
+    beforeEach(async () => {
+      home = await fs.mkdtemp(path.join(os.tmpdir(), "contextstream-index-status-"));
+      vi.stubEnv("HOME", home);
+      vi.stubEnv("USERPROFILE", home);
+    });
+
+    afterEach(async () => {
+      vi.unstubAllEnvs();
+      await fs.rm(home, { recursive: true, force: true });
+    });
+
+    it("should write the resolved project roots next to the status file", async () => {
+      const indexedAt = new Date().toISOString();
+      await writeIndexStatus({
+        version: 1,
+        projects: {
+          "/work/a/": { indexed_at: indexedAt },
+          "/work/b/../c": { indexed_at: indexedAt },
+        },
+      });
+
+      const [signature, ...roots] = (await fs.readFile(getIndexRootsPath(), "utf-8")).split("\n");
+      expect(signature).toBe(indexStatusSignature(await fs.stat(getIndexStatusPath())));
+      expect(roots).toEqual([path.resolve("/work/a"), path.resolve("/work/c")]);
+      // readdir order is filesystem-dependent.
+      expect((await fs.readdir(path.dirname(getIndexRootsPath()))).sort()).toEqual([
+        "indexed-projects.json",
+        "indexed-projects.roots",
+      ]);
+    });
+
+    it("should keep every project when marks overlap", async () => {
+      const projects = ["/work/a", "/work/b", "/work/c"].map((p) => path.resolve(p));
+      await Promise.all(projects.map((p) => markProjectIndexed(p)));
+
+      const status = await readIndexStatus();
+      expect(Object.keys(status.projects).sort()).toEqual(projects);
+      const roots = (await fs.readFile(getIndexRootsPath(), "utf-8")).split("\n").slice(1);
+      expect(roots.sort()).toEqual(projects);
+    });
+  });
+
   // ======================================================================
   // REGRESSION TESTS: Hook loop prevention
   // These tests ensure hooks don't create recursive call patterns
@@ -18,8 +18,9 @@ import { fileURLToPath } from "node:url";
  *
  * Priority:
  * 1. Direct path to installed binary (fastest, no Node overhead)
- * 2. Direct node execution of installed package
- * 3. npx fallback (slower but always works)
+ * 2. Direct node execution of the standalone hook runner (skips loading the MCP server bundle)
+ * 3. Direct node execution of installed package
+ * 4. npx fallback (slower but always works)
  */
 export function getHookCommand(hookName: string): string {
   const isWindows = process.platform === "win32";
@@ -42,10 +43,18 @@ export function getHookCommand(hookName: string): string {
     }
   }
 
-  // Priority 2: Try to find the installed package path
+  // Priority 2/3: Try to find the installed package path
   try {
     // When running from the installed package, __dirname points to dist/
     const __dirname = path.dirname(fileURLToPath(import.meta.url));
+
+    // The hook runner bundle only contains hook code, so node starts much faster
+    // than with the full index.js server bundle on every tool call.
+    const runnerPath = path.join(__dirname, "hooks", "runner.js");
+    if (fsSync.existsSync(runnerPath)) {
+      return `node "${runnerPath}" hook ${hookName}`;
+    }
+
     const indexPath = path.join(__dirname, "index.js");
 
     // Check if the index.js exists (we're running from the installed package)
@@ -103,30 +112,10 @@ export interface ClaudeHooksConfig {
 }
 
 /**
- * The PreToolUse hook script that blocks discovery tools.
- * This is embedded so we can install it without network access.
+ * Python helpers shared by the Claude, Cline and Cursor PreToolUse scripts.
+ * The including script defines INDEX_STATUS_FILE and STALE_THRESHOLD_DAYS.
  */
-export const PRETOOLUSE_HOOK_SCRIPT = `#!/usr/bin/env python3
-"""
-ContextStream PreToolUse Hook for Claude Code
-Blocks Grep/Glob/Search/Explore/Task(Explore|Plan)/EnterPlanMode and redirects to ContextStream.
-
-Only blocks if the current project is indexed in ContextStream.
-If not indexed, allows local tools through with a suggestion to index.
-"""
-
-import json
-import sys
-import os
-from pathlib import Path
-from datetime import datetime, timedelta
-
-ENABLED = os.environ.get("CONTEXTSTREAM_HOOK_ENABLED", "true").lower() == "true"
-INDEX_STATUS_FILE = Path.home() / ".contextstream" / "indexed-projects.json"
-# Consider index stale after 7 days
-STALE_THRESHOLD_DAYS = 7
-
-DISCOVERY_PATTERNS = ["**/*", "**/", "src/**", "lib/**", "app/**", "components/**"]
+const PRETOOLUSE_HOOK_HELPERS = `DISCOVERY_PATTERNS = ["**/*", "**/", "src/**", "lib/**", "app/**", "components/**"]
 
 def is_discovery_glob(pattern):
     pattern_lower = pattern.lower()
@@ -146,11 +135,15 @@ def is_discovery_grep(file_path):
         return True
     return False
 
-def is_project_indexed(cwd: str) -> tuple[bool, bool]:
-    """
-    Check if the current directory is in an indexed project.
-    Returns (is_indexed, is_stale).
-    """
+def is_within(path, root):
+    """True if path is root or below it. Pure string check: no stat calls, no symlink chasing."""
+    if path == root:
+        return True
+    prefix = root if root.endswith(os.sep) else root + os.sep
+    return path.startswith(prefix)
+
+def is_project_indexed(workspace_roots):
+    """Check if any workspace root is in an indexed project."""
     if not INDEX_STATUS_FILE.exists():
         return False, False
 
@@ -161,28 +154,49 @@ def is_project_indexed(cwd: str) -> tuple[bool, bool]:
         return False, False
 
     projects = data.get("projects", {})
-    cwd_path = Path(cwd).resolve()
-
-    # Check if cwd is within any indexed project
-    for project_path, info in projects.items():
-        try:
-            indexed_path = Path(project_path).resolve()
-            # Check if cwd is the project or a subdirectory
-            if cwd_path == indexed_path or indexed_path in cwd_path.parents:
-                # Check if stale
+
+    indexed_paths = [(os.path.abspath(p), info) for p, info in projects.items()]
+
+    for workspace in workspace_roots:
+        cwd_path = os.path.abspath(workspace)
+        for indexed_path, info in indexed_paths:
+            if is_within(cwd_path, indexed_path):
                 indexed_at = info.get("indexed_at")
                 if indexed_at:
                     try:
                         indexed_time = datetime.fromisoformat(indexed_at.replace("Z", "+00:00"))
                         if datetime.now(indexed_time.tzinfo) - indexed_time > timedelta(days=STALE_THRESHOLD_DAYS):
-                            return True, True  # Indexed but stale
+                            return True, True
                     except:
                         pass
-                return True, False  # Indexed and fresh
-        except:
-            continue
+                return True, False
+    return False, False`;
 
-    return False, False
+/**
+ * The PreToolUse hook script that blocks discovery tools.
+ * This is embedded so we can install it without network access.
+ */
+export const PRETOOLUSE_HOOK_SCRIPT = `#!/usr/bin/env python3
+"""
+ContextStream PreToolUse Hook for Claude Code
+Blocks Grep/Glob/Search/Explore/Task(Explore|Plan)/EnterPlanMode and redirects to ContextStream.
+
+Only blocks if the current project is indexed in ContextStream.
+If not indexed, allows local tools through with a suggestion to index.
+"""
+
+import json
+import sys
+import os
+from pathlib import Path
+from datetime import datetime, timedelta
+
+ENABLED = os.environ.get("CONTEXTSTREAM_HOOK_ENABLED", "true").lower() == "true"
+INDEX_STATUS_FILE = Path.home() / ".contextstream" / "indexed-projects.json"
+# Consider index stale after 7 days
+STALE_THRESHOLD_DAYS = 7
+
+${PRETOOLUSE_HOOK_HELPERS}
 
 def main():
     if not ENABLED:
@@ -198,7 +212,7 @@ def main():
     cwd = data.get("cwd", os.getcwd())
 
     # Check if project is indexed
-    is_indexed, is_stale = is_project_indexed(cwd)
+    is_indexed, is_stale = is_project_indexed([cwd])
 
     if not is_indexed:
         # Project not indexed - allow local tools but suggest indexing
@@ -272,16 +286,17 @@ REMINDER = """[CONTEXTSTREAM RULES]
 3. Local tools ONLY if ContextStream returns 0 results
 [END RULES]"""
 
+# The response never changes, so serialize it once.
+PAYLOAD = (json.dumps({"hookSpecificOutput": {"hookEventName": "UserPromptSubmit", "additionalContext": REMINDER}}) + "\\n").encode()
+
 def main():
     if not ENABLED:
         sys.exit(0)
 
-    try:
-        json.load(sys.stdin)
-    except:
-        sys.exit(0)
+    # Nothing from the event is used; drain stdin without decoding it.
+    sys.stdin.buffer.read()
 
-    print(json.dumps({"hookSpecificOutput": {"hookEventName": "UserPromptSubmit", "additionalContext": REMINDER}}))
+    sys.stdout.buffer.write(PAYLOAD)
     sys.exit(0)
 
 if __name__ == "__main__":
@@ -1326,6 +1341,25 @@ export function getIndexStatusPath(): string {
   return path.join(homedir(), ".contextstream", "indexed-projects.json");
 }
 
+/**
+ * Plain-text list of indexed project roots, one resolved path per line.
+ * Written alongside the status file so the hook can rule out unindexed
+ * directories without parsing JSON. The first line holds the status file's
+ * signature (see indexStatusSignature) at the time the list was written.
+ */
+export function getIndexRootsPath(): string {
+  return path.join(homedir(), ".contextstream", "indexed-projects.roots");
+}
+
+/**
+ * Identify a version of the status file by mtime and size. Timestamps are too
+ * coarse to order the status and roots writes, so the hook compares this for
+ * an exact match instead.
+ */
+export function indexStatusSignature(stat: { mtimeMs: number; size: number }): string {
+  return `${stat.mtimeMs} ${stat.size}`;
+}
+
 export interface IndexedProjectInfo {
   indexed_at: string;
   project_id?: string;
@@ -1351,13 +1385,38 @@ export async function readIndexStatus(): Promise<IndexStatusFile> {
 }
 
 /**
- * Write the index status file.
+ * Tail of the queued index status updates. markProjectIndexed is often called
+ * fire-and-forget, so updates are chained to keep their read-modify-write
+ * cycles from interleaving.
  */
-export async function writeIndexStatus(status: IndexStatusFile): Promise<void> {
+let indexStatusQueue: Promise<void> = Promise.resolve();
+
+function queueIndexStatusUpdate(update: () => Promise<void>): Promise<void> {
+  const result = indexStatusQueue.then(update);
+  indexStatusQueue = result.catch(() => {});
+  return result;
+}
+
+async function writeIndexStatusFiles(status: IndexStatusFile): Promise<void> {
   const statusPath = getIndexStatusPath();
   const dir = path.dirname(statusPath);
   await fs.mkdir(dir, { recursive: true });
   await fs.writeFile(statusPath, JSON.stringify(status, null, 2));
+  // Stamped with the status file's signature so the hook can tell the list is
+  // current, and renamed into place so it never reads a partial list.
+  const signature = indexStatusSignature(await fs.stat(statusPath));
+  const rootsPath = getIndexRootsPath();
+  const tmpPath = `${rootsPath}.${process.pid}.tmp`;
+  const roots = Object.keys(status.projects).map((p) => path.resolve(p));
+  await fs.writeFile(tmpPath, [signature, ...roots].join("\n"));
+  await fs.rename(tmpPath, rootsPath);
+}
+
+/**
+ * Write the index status file.
+ */
+export async function writeIndexStatus(status: IndexStatusFile): Promise<void> {
+  await queueIndexStatusUpdate(() => writeIndexStatusFiles(status));
 }
 
 /**
@@ -1367,28 +1426,28 @@ export async function markProjectIndexed(
   projectPath: string,
   options?: { project_id?: string; project_name?: string }
 ): Promise<void> {
-  const status = await readIndexStatus();
   const resolvedPath = path.resolve(projectPath);
-
-  status.projects[resolvedPath] = {
-    indexed_at: new Date().toISOString(),
-    project_id: options?.project_id,
-    project_name: options?.project_name,
-  };
-
-  await writeIndexStatus(status);
+  await queueIndexStatusUpdate(async () => {
+    const status = await readIndexStatus();
+    status.projects[resolvedPath] = {
+      indexed_at: new Date().toISOString(),
+      project_id: options?.project_id,
+      project_name: options?.project_name,
+    };
+    await writeIndexStatusFiles(status);
+  });
 }
 
 /**
  * Remove a project from the index status (e.g., on delete or explicit removal).
  */
 export async function unmarkProjectIndexed(projectPath: string): Promise<void> {
-  const status = await readIndexStatus();
   const resolvedPath = path.resolve(projectPath);
-
-  delete status.projects[resolvedPath];
-
-  await writeIndexStatus(status);
+  await queueIndexStatusUpdate(async () => {
+    const status = await readIndexStatus();
+    delete status.projects[resolvedPath];
+    await writeIndexStatusFiles(status);
+  });
 }
 
 /**
@@ -1438,57 +1497,7 @@ ENABLED = os.environ.get("CONTEXTSTREAM_HOOK_ENABLED", "true").lower() == "true"
 INDEX_STATUS_FILE = Path.home() / ".contextstream" / "indexed-projects.json"
 STALE_THRESHOLD_DAYS = 7
 
-DISCOVERY_PATTERNS = ["**/*", "**/", "src/**", "lib/**", "app/**", "components/**"]
-
-def is_discovery_glob(pattern):
-    pattern_lower = pattern.lower()
-    for p in DISCOVERY_PATTERNS:
-        if p in pattern_lower:
-            return True
-    if pattern_lower.startswith("**/*.") or pattern_lower.startswith("**/"):
-        return True
-    if "**" in pattern or "*/" in pattern:
-        return True
-    return False
-
-def is_discovery_grep(file_path):
-    if not file_path or file_path in [".", "./", "*", "**"]:
-        return True
-    if "*" in file_path or "**" in file_path:
-        return True
-    return False
-
-def is_project_indexed(workspace_roots):
-    """Check if any workspace root is in an indexed project."""
-    if not INDEX_STATUS_FILE.exists():
-        return False, False
-
-    try:
-        with open(INDEX_STATUS_FILE, "r") as f:
-            data = json.load(f)
-    except:
-        return False, False
-
-    projects = data.get("projects", {})
-
-    for workspace in workspace_roots:
-        cwd_path = Path(workspace).resolve()
-        for project_path, info in projects.items():
-            try:
-                indexed_path = Path(project_path).resolve()
-                if cwd_path == indexed_path or indexed_path in cwd_path.parents:
-                    indexed_at = info.get("indexed_at")
-                    if indexed_at:
-                        try:
-                            indexed_time = datetime.fromisoformat(indexed_at.replace("Z", "+00:00"))
-                            if datetime.now(indexed_time.tzinfo) - indexed_time > timedelta(days=STALE_THRESHOLD_DAYS):
-                                return True, True
-                        except:
-                            pass
-                    return True, False
-            except:
-                continue
-    return False, False
+${PRETOOLUSE_HOOK_HELPERS}
 
 def output_allow(context_mod=None):
     result = {"cancel": False}
@@ -1567,21 +1576,19 @@ REMINDER = """[CONTEXTSTREAM RULES]
 3. Local tools ONLY if ContextStream returns 0 results
 [END RULES]"""
 
+# Responses never change, so serialize them once.
+ALLOW_PAYLOAD = (json.dumps({"cancel": False}) + "\\n").encode()
+REMINDER_PAYLOAD = (json.dumps({"cancel": False, "contextModification": REMINDER}) + "\\n").encode()
+
 def main():
     if not ENABLED:
-        print(json.dumps({"cancel": False}))
+        sys.stdout.buffer.write(ALLOW_PAYLOAD)
         sys.exit(0)
 
-    try:
-        json.load(sys.stdin)
-    except:
-        print(json.dumps({"cancel": False}))
-        sys.exit(0)
+    # Nothing from the event is used; drain stdin without decoding it.
+    sys.stdin.buffer.read()
 
-    print(json.dumps({
-        "cancel": False,
-        "contextModification": REMINDER
-    }))
+    sys.stdout.buffer.write(REMINDER_PAYLOAD)
     sys.exit(0)
 
 if __name__ == "__main__":
@@ -1848,57 +1855,7 @@ ENABLED = os.environ.get("CONTEXTSTREAM_HOOK_ENABLED", "true").lower() == "true"
 INDEX_STATUS_FILE = Path.home() / ".contextstream" / "indexed-projects.json"
 STALE_THRESHOLD_DAYS = 7
 
-DISCOVERY_PATTERNS = ["**/*", "**/", "src/**", "lib/**", "app/**", "components/**"]
-
-def is_discovery_glob(pattern):
-    pattern_lower = pattern.lower()
-    for p in DISCOVERY_PATTERNS:
-        if p in pattern_lower:
-            return True
-    if pattern_lower.startswith("**/*.") or pattern_lower.startswith("**/"):
-        return True
-    if "**" in pattern or "*/" in pattern:
-        return True
-    return False
-
-def is_discovery_grep(file_path):
-    if not file_path or file_path in [".", "./", "*", "**"]:
-        return True
-    if "*" in file_path or "**" in file_path:
-        return True
-    return False
-
-def is_project_indexed(workspace_roots):
-    """Check if any workspace root is in an indexed project."""
-    if not INDEX_STATUS_FILE.exists():
-        return False, False
-
-    try:
-        with open(INDEX_STATUS_FILE, "r") as f:
-            data = json.load(f)
-    except:
-        return False, False
-
-    projects = data.get("projects", {})
-
-    for workspace in workspace_roots:
-        cwd_path = Path(workspace).resolve()
-        for project_path, info in projects.items():
-            try:
-                indexed_path = Path(project_path).resolve()
-                if cwd_path == indexed_path or indexed_path in cwd_path.parents:
-                    indexed_at = info.get("indexed_at")
-                    if indexed_at:
-                        try:
-                            indexed_time = datetime.fromisoformat(indexed_at.replace("Z", "+00:00"))
-                            if datetime.now(indexed_time.tzinfo) - indexed_time > timedelta(days=STALE_THRESHOLD_DAYS):
-                                return True, True
-                        except:
-                            pass
-                    return True, False
-            except:
-                continue
-    return False, False
+${PRETOOLUSE_HOOK_HELPERS}
 
 def output_allow():
     print(json.dumps({"decision": "allow"}))
@@ -1969,21 +1926,22 @@ import os
 
 ENABLED = os.environ.get("CONTEXTSTREAM_REMINDER_ENABLED", "true").lower() == "true"
 
+# Responses never change, so serialize them once.
+CONTINUE_PAYLOAD = (json.dumps({"continue": True}) + "\\n").encode()
+REMINDER_PAYLOAD = (json.dumps({
+    "continue": True,
+    "user_message": "[CONTEXTSTREAM] Search with mcp__contextstream__search before using Glob/Grep/Read"
+}) + "\\n").encode()
+
 def main():
     if not ENABLED:
-        print(json.dumps({"continue": True}))
+        sys.stdout.buffer.write(CONTINUE_PAYLOAD)
         sys.exit(0)
 
-    try:
-        json.load(sys.stdin)
-    except:
-        print(json.dumps({"continue": True}))
-        sys.exit(0)
+    # Nothing from the event is used; drain stdin without decoding it.
+    sys.stdin.buffer.read()
 
-    print(json.dumps({
-        "continue": True,
-        "user_message": "[CONTEXTSTREAM] Search with mcp__contextstream__search before using Glob/Grep/Read"
-    }))
+    sys.stdout.buffer.write(REMINDER_PAYLOAD)
     sys.exit(0)
 
 if __name__ == "__main__":
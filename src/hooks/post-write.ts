@@ -142,31 +142,6 @@ function extractCwd(input: HookInput): string {
   return process.cwd();
 }
 
-/**
- * Find .contextstream/config.json by traversing up from a directory.
- */
-function findLocalConfig(startDir: string): LocalConfig | null {
-  let currentDir = path.resolve(startDir);
-
-  for (let i = 0; i < 10; i++) {
-    const configPath = path.join(currentDir, ".contextstream", "config.json");
-    if (fs.existsSync(configPath)) {
-      try {
-        const content = fs.readFileSync(configPath, "utf-8");
-        return JSON.parse(content) as LocalConfig;
-      } catch {
-        // Continue searching
-      }
-    }
-
-    const parentDir = path.dirname(currentDir);
-    if (parentDir === currentDir) break;
-    currentDir = parentDir;
-  }
-
-  return null;
-}
-
 /**
  * Load API config from .mcp.json if env vars not set.
  */
@@ -386,15 +361,33 @@ async function indexFile(
 }
 
 /**
- * Find project root by looking for .contextstream/config.json
+ * Find the project root and its .contextstream/config.json in one upward walk.
+ *
+ * Each level costs a single read attempt; a missing file is just a failed read.
+ * The root is the nearest directory with a config file, and if that file is not
+ * valid JSON the search continues upward for a parseable one.
  */
-function findProjectRoot(filePath: string): string | null {
+function findProjectConfig(
+  filePath: string
+): { projectRoot: string; config: LocalConfig | null } | null {
   let currentDir = path.dirname(path.resolve(filePath));
+  let projectRoot: string | null = null;
 
   for (let i = 0; i < 10; i++) {
-    const configPath = path.join(currentDir, ".contextstream", "config.json");
-    if (fs.existsSync(configPath)) {
-      return currentDir;
+    let content: string | null = null;
+    try {
+      content = fs.readFileSync(path.join(currentDir, ".contextstream", "config.json"), "utf-8");
+    } catch {
+      // No config at this level
+    }
+
+    if (content !== null) {
+      if (!projectRoot) projectRoot = currentDir;
+      try {
+        return { projectRoot, config: JSON.parse(content) as LocalConfig };
+      } catch {
+        // Continue searching
+      }
     }
 
     const parentDir = path.dirname(currentDir);
@@ -402,7 +395,7 @@ function findProjectRoot(filePath: string): string | null {
     currentDir = parentDir;
   }
 
-  return null;
+  return projectRoot ? { projectRoot, config: null } : null;
 }
 
 /**
@@ -415,10 +408,13 @@ export async function runPostWriteHook(): Promise<void> {
     process.exit(0);
   }
 
-  // Read stdin
+  // Read stdin in one call; decoding the whole buffer at once also keeps
+  // multi-byte characters intact across pipe chunk boundaries.
   let inputData = "";
-  for await (const chunk of process.stdin) {
-    inputData += chunk;
+  try {
+    inputData = fs.readFileSync(0, "utf-8");
+  } catch {
+    process.exit(0);
   }
 
   if (!inputData.trim()) {
@@ -448,15 +444,12 @@ export async function runPostWriteHook(): Promise<void> {
   }
 
   // Find project config
-  const projectRoot = findProjectRoot(absolutePath);
-  if (!projectRoot) {
-    process.exit(0);
-  }
-
-  const localConfig = findLocalConfig(projectRoot);
-  if (!localConfig?.project_id) {
+  const found = findProjectConfig(absolutePath);
+  const localConfig = found?.config;
+  if (!found || !localConfig?.project_id) {
     process.exit(0);
   }
+  const { projectRoot } = found;
 
   // Load API config
   const { apiUrl, apiKey } = loadApiConfig(projectRoot);
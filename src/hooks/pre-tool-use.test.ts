@@ -0,0 +1,132 @@
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+import * as fs from "node:fs";
+import * as os from "node:os";
+import * as path from "node:path";
+import { writeIndexStatus } from "../hooks-config.js";
+
+type PreToolUseModule = typeof import("./pre-tool-use.js");
+
+describe("pre-tool-use", () => {
+  let home: string;
+  let statusFile: string;
+  let rootsFile: string;
+  let hook: PreToolUseModule;
+
+  // The project directory never needs to exist; containment is a path check.
+  const projectDir = path.resolve("/work/indexed-project");
+  const freshEntry = { indexed_at: new Date().toISOString() };
+  const staleEntry = { indexed_at: new Date(Date.now() - 8 * 24 * 60 * 60 * 1000).toISOString() };
+
+  function writeStatusFile(entry: { indexed_at: string } = freshEntry): void {
+    fs.writeFileSync(statusFile, JSON.stringify({ version: 1, projects: { [projectDir]: entry } }));
+  }
+
+  function writeIndexStatusFor(entry: { indexed_at: string } = freshEntry): Promise<void> {
+    return writeIndexStatus({ version: 1, projects: { [projectDir]: entry } });
+  }
+
+  beforeEach(async () => {
+    home = fs.mkdtempSync(path.join(os.tmpdir(), "contextstream-pre-tool-use-"));
+    vi.stubEnv("HOME", home);
+    vi.stubEnv("USERPROFILE", home);
+    statusFile = path.join(home, ".contextstream", "indexed-projects.json");
+    rootsFile = path.join(home, ".contextstream", "indexed-projects.roots");
+    fs.mkdirSync(path.dirname(statusFile), { recursive: true });
+    // The index file paths are resolved from the home directory at module load.
+    vi.resetModules();
+    hook = await import("./pre-tool-use.js");
+  });
+
+  afterEach(() => {
+    vi.unstubAllEnvs();
+    fs.rmSync(home, { recursive: true, force: true });
+  });
+
+  // These run the lookup against in-memory status data, so they need no
+  // status file on disk.
+  describe("lookupIndexedProject", () => {
+    it("should return false when no projects are indexed", () => {
+      const result = hook.lookupIndexedProject(projectDir, new Map());
+      expect(result.isIndexed).toBe(false);
+    });
+
+    it.each([
+      ["the project root", "", true],
+      ["a subdirectory", "src/components", true],
+      // Shares the project path as a string prefix but is not inside it.
+      ["a sibling with the same prefix", "../indexed-project-outside", false],
+    ])("should check containment for %s", (_label, relative, expected) => {
+      const projects = hook.indexProjectsByPath({ [projectDir]: freshEntry });
+      const result = hook.lookupIndexedProject(path.join(projectDir, relative), projects);
+      expect(result.isIndexed).toBe(expected);
+    });
+
+    it("should match project paths stored with a trailing separator", () => {
+      const projects = hook.indexProjectsByPath({ [`${projectDir}${path.sep}`]: freshEntry });
+      expect(hook.lookupIndexedProject(projectDir, projects)).toEqual({
+        isIndexed: true,
+        isStale: false,
+      });
+    });
+
+    it("should flag projects indexed more than 7 days ago as stale", () => {
+      const projects = hook.indexProjectsByPath({ [projectDir]: staleEntry });
+      expect(hook.lookupIndexedProject(projectDir, projects)).toEqual({
+        isIndexed: true,
+        isStale: true,
+      });
+    });
+  });
+
+  describe("isProjectIndexed", () => {
+    it("should read the status file from the home directory", () => {
+      writeStatusFile();
+      expect(hook.isProjectIndexed(path.join(projectDir, "src"))).toEqual({
+        isIndexed: true,
+        isStale: false,
+      });
+    });
+
+    it("should report stale entries from the status file", async () => {
+      await writeIndexStatusFor(staleEntry);
+      expect(hook.isProjectIndexed(projectDir)).toEqual({ isIndexed: true, isStale: true });
+    });
+
+    it("should not read the status file when the roots file rules the directory out", () => {
+      writeStatusFile();
+      const stat = fs.statSync(statusFile);
+      fs.writeFileSync(rootsFile, `${stat.mtimeMs} ${stat.size}`);
+      expect(hook.isProjectIndexed(projectDir)).toEqual({ isIndexed: false, isStale: false });
+    });
+
+    it("should treat a missing status file as nothing indexed", () => {
+      expect(hook.isProjectIndexed(projectDir)).toEqual({ isIndexed: false, isStale: false });
+    });
+  });
+
+  describe("mayBeIndexed", () => {
+    it("should rule out directories outside every indexed root", async () => {
+      await writeIndexStatusFor();
+      expect(hook.mayBeIndexed(path.resolve("/work/other-project"))).toBe(false);
+    });
+
+    it("should allow directories inside an indexed root", async () => {
+      await writeIndexStatusFor();
+      expect(hook.mayBeIndexed(projectDir)).toBe(true);
+      expect(hook.mayBeIndexed(path.join(projectDir, "src", "lib"))).toBe(true);
+    });
+
+    it("should fall back to the status file when the roots file is missing", () => {
+      writeStatusFile();
+      expect(hook.mayBeIndexed(path.resolve("/work/other-project"))).toBe(true);
+    });
+
+    it("should fall back when the status file changed after the roots file", async () => {
+      await writeIndexStatusFor();
+      // Rewritten without the roots file, as an older server version would.
+      const projects = { [projectDir]: freshEntry, "/work/other": freshEntry };
+      fs.writeFileSync(statusFile, JSON.stringify({ version: 1, projects }));
+      expect(hook.mayBeIndexed(path.resolve("/work/other-project"))).toBe(true);
+    });
+  });
+});
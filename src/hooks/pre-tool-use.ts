@@ -27,11 +27,66 @@ import {
 
 const ENABLED = process.env.CONTEXTSTREAM_HOOK_ENABLED !== "false";
 const INDEX_STATUS_FILE = path.join(homedir(), ".contextstream", "indexed-projects.json");
+const INDEX_ROOTS_FILE = path.join(homedir(), ".contextstream", "indexed-projects.roots");
+const DEBUG = process.env.CONTEXTSTREAM_HOOK_DEBUG === "true";
 const DEBUG_FILE = "/tmp/pretooluse-hook-debug.log";
 const STALE_THRESHOLD_DAYS = 7;
 const CONTEXT_FRESHNESS_SECONDS = 120;
 
 const DISCOVERY_PATTERNS = ["**/*", "**/", "src/**", "lib/**", "app/**", "components/**"];
+// Any recursive (**) or directory (*/) wildcard also counts as a discovery glob.
+const DISCOVERY_GLOB_RE = new RegExp(
+  [
+    ...DISCOVERY_PATTERNS.map((p) => p.replace(/[.*+?^${}()|[\]\\]/g, "\\$&")),
+    "\\*\\*",
+    "\\*/",
+  ].join("|")
+);
+
+// Lowercased local tool names that never change workspace state.
+const READ_ONLY_TOOL_NAMES = new Set([
+  "read",
+  "read_file",
+  "grep",
+  "glob",
+  "search",
+  "grep_search",
+  "code_search",
+  "semanticsearch",
+  "codebase_search",
+  "list_files",
+  "search_files",
+  "search_files_content",
+  "find_files",
+  "find_by_name",
+  "ls",
+  "cat",
+  "view",
+]);
+
+const WRITE_MARKERS = [
+  "write",
+  "edit",
+  "create",
+  "delete",
+  "remove",
+  "rename",
+  "move",
+  "patch",
+  "apply",
+  "insert",
+  "append",
+  "replace",
+  "update",
+  "commit",
+  "push",
+  "install",
+  "exec",
+  "run",
+  "bash",
+  "shell",
+];
+const WRITE_MARKER_RE = new RegExp(WRITE_MARKERS.join("|"));
 
 interface HookInput {
   // Claude Code format
@@ -62,7 +117,7 @@ interface HookInput {
   workspaceRoots?: string[];
 }
 
-interface IndexedProjectInfo {
+export interface IndexedProjectInfo {
   indexed_at: string;
   project_id?: string;
   project_name?: string;
@@ -73,78 +128,124 @@ interface IndexStatusFile {
   projects: Record<string, IndexedProjectInfo>;
 }
 
+function debugLog(message: string): void {
+  if (!DEBUG) return;
+  try {
+    fs.appendFileSync(DEBUG_FILE, `${message}\n`);
+  } catch {
+    // best effort
+  }
+}
+
 function isDiscoveryGlob(pattern: string): boolean {
-  const patternLower = pattern.toLowerCase();
+  return DISCOVERY_GLOB_RE.test(pattern.toLowerCase());
+}
 
-  for (const p of DISCOVERY_PATTERNS) {
-    if (patternLower.includes(p)) {
-      return true;
-    }
-  }
+function isDiscoveryGrep(filePath: string | undefined): boolean {
+  return !filePath || filePath === "." || filePath === "./" || filePath.includes("*");
+}
 
-  if (patternLower.startsWith("**/*.") || patternLower.startsWith("**/")) {
-    return true;
+/**
+ * Read the indexed projects keyed by resolved path. Hooks run once per process,
+ * so the file is simply read; a missing file means nothing is indexed.
+ */
+function readIndexedProjects(): Map<string, IndexedProjectInfo> | null {
+  let data: IndexStatusFile;
+  try {
+    const content = fs.readFileSync(INDEX_STATUS_FILE, "utf-8");
+    data = JSON.parse(content);
+  } catch {
+    return null;
   }
 
-  if (patternLower.includes("**") || patternLower.includes("*/")) {
-    return true;
+  return indexProjectsByPath(data.projects || {});
+}
+
+/**
+ * Key the status file's projects by resolved path so lookups are exact matches
+ * (trailing slashes, "..", etc.). The first entry wins when two keys resolve
+ * to the same path.
+ */
+export function indexProjectsByPath(
+  projects: Record<string, IndexedProjectInfo>
+): Map<string, IndexedProjectInfo> {
+  const byPath = new Map<string, IndexedProjectInfo>();
+  for (const [projectPath, info] of Object.entries(projects)) {
+    const resolved = path.resolve(projectPath);
+    if (!byPath.has(resolved)) {
+      byPath.set(resolved, info);
+    }
   }
+  return byPath;
+}
 
-  return false;
+function isIndexStale(indexedAt: string | undefined): boolean {
+  if (!indexedAt) return false;
+  // Unparseable timestamps yield NaN and are treated as fresh.
+  const diffDays = (Date.now() - Date.parse(indexedAt)) / (1000 * 60 * 60 * 24);
+  return diffDays > STALE_THRESHOLD_DAYS;
 }
 
-function isDiscoveryGrep(filePath: string | undefined): boolean {
-  if (!filePath || filePath === "." || filePath === "./" || filePath === "*" || filePath === "**") {
+/**
+ * Walk up from dir (inclusive) and return the first ancestor in roots, so the
+ * cost is bounded by path depth, not project count.
+ */
+function findIndexedAncestor(dir: string, roots: { has(key: string): boolean }): string | null {
+  while (true) {
+    if (roots.has(dir)) return dir;
+    const parent = path.dirname(dir);
+    if (parent === dir) return null;
+    dir = parent;
+  }
+}
+
+/**
+ * Cheap negative check against the roots list written next to the status file.
+ * Returns false only when no ancestor of dir is an indexed root. A missing
+ * roots file, or one whose first line does not match the status file's current
+ * signature, returns true so the caller falls back to the JSON.
+ */
+export function mayBeIndexed(dir: string): boolean {
+  let lines: string[];
+  let stat: fs.Stats;
+  try {
+    lines = fs.readFileSync(INDEX_ROOTS_FILE, "utf-8").split("\n");
+    stat = fs.statSync(INDEX_STATUS_FILE);
+  } catch {
     return true;
   }
-  if (filePath.includes("*") || filePath.includes("**")) {
+  // Same format as indexStatusSignature in hooks-config.ts.
+  if (lines[0] !== `${stat.mtimeMs} ${stat.size}`) {
     return true;
   }
-  return false;
+  return findIndexedAncestor(dir, new Set(lines.slice(1))) !== null;
 }
 
-
-function isProjectIndexed(cwd: string): { isIndexed: boolean; isStale: boolean } {
-  if (!fs.existsSync(INDEX_STATUS_FILE)) {
+export function isProjectIndexed(cwd: string): { isIndexed: boolean; isStale: boolean } {
+  const dir = path.resolve(cwd);
+  if (!mayBeIndexed(dir)) {
     return { isIndexed: false, isStale: false };
   }
 
-  let data: IndexStatusFile;
-  try {
-    const content = fs.readFileSync(INDEX_STATUS_FILE, "utf-8");
-    data = JSON.parse(content);
-  } catch {
+  const projects = readIndexedProjects();
+  if (!projects) {
     return { isIndexed: false, isStale: false };
   }
 
-  const projects = data.projects || {};
-  const cwdPath = path.resolve(cwd);
+  return lookupIndexedProject(dir, projects);
+}
 
-  for (const [projectPath, info] of Object.entries(projects)) {
-    try {
-      const indexedPath = path.resolve(projectPath);
-
-      // Check if cwd is the project or a subdirectory
-      if (cwdPath === indexedPath || cwdPath.startsWith(indexedPath + path.sep)) {
-        // Check if stale
-        const indexedAt = info.indexed_at;
-        if (indexedAt) {
-          try {
-            const indexedTime = new Date(indexedAt);
-            const now = new Date();
-            const diffDays = (now.getTime() - indexedTime.getTime()) / (1000 * 60 * 60 * 24);
-            if (diffDays > STALE_THRESHOLD_DAYS) {
-              return { isIndexed: true, isStale: true };
-            }
-          } catch {
-            // Ignore date parsing errors
-          }
-        }
-        return { isIndexed: true, isStale: false };
-      }
-    } catch {
-      continue;
-    }
+/**
+ * Check cwd against projects already loaded by indexProjectsByPath. Pure, so
+ * it can be exercised without a status file on disk.
+ */
+export function lookupIndexedProject(
+  cwd: string,
+  projects: Map<string, IndexedProjectInfo>
+): { isIndexed: boolean; isStale: boolean } {
+  const root = findIndexedAncestor(path.resolve(cwd), projects);
+  if (root) {
+    return { isIndexed: true, isStale: isIndexStale(projects.get(root)?.indexed_at) };
   }
 
   return { isIndexed: false, isStale: false };
@@ -237,53 +338,11 @@ function isLikelyStateChangingTool(
     return !isContextstreamReadOnlyOperation(normalizedContextstreamTool, toolInput);
   }
 
-  if (
-    [
-      "read",
-      "read_file",
-      "grep",
-      "glob",
-      "search",
-      "grep_search",
-      "code_search",
-      "semanticsearch",
-      "codebase_search",
-      "list_files",
-      "search_files",
-      "search_files_content",
-      "find_files",
-      "find_by_name",
-      "ls",
-      "cat",
-      "view",
-    ].includes(toolLower)
-  ) {
+  if (READ_ONLY_TOOL_NAMES.has(toolLower)) {
     return false;
   }
 
-  const writeMarkers = [
-    "write",
-    "edit",
-    "create",
-    "delete",
-    "remove",
-    "rename",
-    "move",
-    "patch",
-    "apply",
-    "insert",
-    "append",
-    "replace",
-    "update",
-    "commit",
-    "push",
-    "install",
-    "exec",
-    "run",
-    "bash",
-    "shell",
-  ];
-  return writeMarkers.some((marker) => toolLower.includes(marker));
+  return WRITE_MARKER_RE.test(toolLower);
 }
 
 /**
@@ -300,7 +359,7 @@ function blockClaudeCode(message: string): never {
       additionalContext: `[CONTEXTSTREAM] ${message}`,
     },
   };
-  fs.appendFileSync(DEBUG_FILE, `[PreToolUse] REDIRECT (additionalContext): ${JSON.stringify(response)}\n`);
+  debugLog(`[PreToolUse] REDIRECT (additionalContext): ${JSON.stringify(response)}`);
   console.log(JSON.stringify(response));
   process.exit(0);
 }
@@ -379,21 +438,137 @@ function detectEditorFormat(input: HookInput): "claude" | "cline" | "cursor" {
   return "claude";
 }
 
+interface DiscoveryRedirect {
+  message: string;
+  contextMod: string;
+}
+
+const SEARCH_CONTEXT_MOD = "[CONTEXTSTREAM] Use ContextStream search for code discovery.";
+const PLAN_CONTEXT_MOD = "[CONTEXTSTREAM] Use ContextStream plans for persistence.";
+
+// Messages that don't depend on the tool input are built once per process.
+const INIT_REQUIRED_MESSAGE =
+  'First call required for this session: mcp__contextstream__init(...). Run it before any other MCP tool. Then call mcp__contextstream__context(user_message="...", save_exchange=true, session_id="<session-id>").';
+const CONTEXT_REQUIRED_MESSAGE =
+  'First call required for this prompt: mcp__contextstream__context(user_message="...", save_exchange=true, session_id="<session-id>"). Run it before any other MCP tool.';
+
+const EXPLORE_REDIRECT: DiscoveryRedirect = {
+  message:
+    'Project index is current. Use mcp__contextstream__search(mode="auto", output_format="paths") instead of Explore for broad discovery.',
+  contextMod: SEARCH_CONTEXT_MOD,
+};
+const TASK_EXPLORE_REDIRECT: DiscoveryRedirect = {
+  message:
+    'Project index is current. Use mcp__contextstream__search(mode="auto") instead of Task(Explore) for broad discovery.',
+  contextMod: SEARCH_CONTEXT_MOD,
+};
+const TASK_PLAN_REDIRECT: DiscoveryRedirect = {
+  message:
+    'For planning, use mcp__contextstream__search(mode="auto", output_format="paths") for discovery, then save your plan with mcp__contextstream__session(action="capture_plan"). Then create tasks with mcp__contextstream__memory(action="create_task", title="...", plan_id="...").',
+  contextMod: PLAN_CONTEXT_MOD,
+};
+const ENTER_PLAN_MODE_REDIRECT: DiscoveryRedirect = {
+  message:
+    'After finalizing your plan, save it to ContextStream (not a local markdown file): mcp__contextstream__session(action="capture_plan", title="...", steps=[...]). Then create tasks with mcp__contextstream__memory(action="create_task", title="...", plan_id="...").',
+  contextMod: PLAN_CONTEXT_MOD,
+};
+
+type RedirectHandler = (
+  toolInput: HookInput["tool_input"],
+  tool: string
+) => DiscoveryRedirect | null;
+
+function redirectGlob(toolInput: HookInput["tool_input"]): DiscoveryRedirect | null {
+  const pattern = toolInput?.pattern || "";
+  // Only intercept broad discovery patterns (e.g., **/*.ts, src/**)
+  if (!isDiscoveryGlob(pattern)) return null;
+  return {
+    message: `This project index is current. Use mcp__contextstream__search(mode="auto", query="${pattern}") instead of Glob for faster, richer code results.`,
+    contextMod: SEARCH_CONTEXT_MOD,
+  };
+}
+
+function redirectGrep(toolInput: HookInput["tool_input"], tool: string): DiscoveryRedirect | null {
+  const pattern = toolInput?.pattern || "";
+  const filePath = toolInput?.path || "";
+  if (!pattern) return null;
+
+  if (filePath && !isDiscoveryGrep(filePath)) {
+    return {
+      message: `STOP: Use Read("${filePath}") to view file content, or mcp__contextstream__search(mode="keyword", query="${pattern}") for codebase search.`,
+      contextMod: SEARCH_CONTEXT_MOD,
+    };
+  }
+  return {
+    message: `This project index is current. Use mcp__contextstream__search(mode="auto", query="${pattern}") instead of ${tool} for faster, richer code results.`,
+    contextMod: SEARCH_CONTEXT_MOD,
+  };
+}
+
+function redirectTask(toolInput: HookInput["tool_input"]): DiscoveryRedirect | null {
+  const subagentTypeRaw =
+    (toolInput as { subagent_type?: string; subagentType?: string })?.subagent_type ||
+    (toolInput as { subagent_type?: string; subagentType?: string })?.subagentType ||
+    "";
+  const subagentType = subagentTypeRaw.toLowerCase();
+  if (subagentType.includes("explore")) return TASK_EXPLORE_REDIRECT;
+  if (subagentType.includes("plan")) return TASK_PLAN_REDIRECT;
+  return null;
+}
+
+// Cline/Cursor specific tool names
+function redirectListOrSearchFiles(
+  toolInput: HookInput["tool_input"],
+  tool: string
+): DiscoveryRedirect | null {
+  const pattern = toolInput?.path || (toolInput as { regex?: string })?.regex || "";
+  if (!isDiscoveryGlob(pattern) && !isDiscoveryGrep(pattern)) return null;
+  return {
+    message: `Project index is current. Use mcp__contextstream__search(mode="auto", query="${pattern}") instead of ${tool} for faster, richer code results.`,
+    contextMod: SEARCH_CONTEXT_MOD,
+  };
+}
+
+// A Map rather than an object literal so tool names like "constructor" can't
+// resolve to Object.prototype members.
+const REDIRECT_HANDLERS = new Map<string, RedirectHandler>([
+  ["Glob", redirectGlob],
+  ["Grep", redirectGrep],
+  ["Search", redirectGrep],
+  ["Explore", () => EXPLORE_REDIRECT],
+  ["Task", redirectTask],
+  ["EnterPlanMode", () => ENTER_PLAN_MODE_REDIRECT],
+  ["list_files", redirectListOrSearchFiles],
+  ["search_files", redirectListOrSearchFiles],
+]);
+
+/**
+ * Work out whether a tool call should be redirected to ContextStream.
+ * Pure string checks only - the caller decides whether the index is current.
+ */
+function getDiscoveryRedirect(
+  tool: string,
+  toolInput: HookInput["tool_input"]
+): DiscoveryRedirect | null {
+  const handler = REDIRECT_HANDLERS.get(tool);
+  return handler ? handler(toolInput, tool) : null;
+}
+
 export async function runPreToolUseHook(): Promise<void> {
-  // Debug: write to file to prove hook was invoked
-    fs.appendFileSync(DEBUG_FILE, `[PreToolUse] Hook invoked at ${new Date().toISOString()}\n`);
-  console.error("[PreToolUse] Hook invoked at", new Date().toISOString());
+  debugLog(`[PreToolUse] Hook invoked at ${new Date().toISOString()}`);
 
   if (!ENABLED) {
-    fs.appendFileSync(DEBUG_FILE, "[PreToolUse] Hook disabled, exiting\n");
-    console.error("[PreToolUse] Hook disabled, exiting");
+    debugLog("[PreToolUse] Hook disabled, exiting");
     process.exit(0);
   }
 
-  // Read stdin
+  // Read stdin in one call; decoding the whole buffer at once also keeps
+  // multi-byte characters intact across pipe chunk boundaries.
   let inputData = "";
-  for await (const chunk of process.stdin) {
-    inputData += chunk;
+  try {
+    inputData = fs.readFileSync(0, "utf-8");
+  } catch {
+    process.exit(0);
   }
 
   if (!inputData.trim()) {
@@ -421,7 +596,7 @@ export async function runPreToolUseHook(): Promise<void> {
     normalizedContextstreamTool
   );
 
-  fs.appendFileSync(DEBUG_FILE, `[PreToolUse] tool=${tool}, cwd=${cwd}, editorFormat=${editorFormat}\n`);
+  debugLog(`[PreToolUse] tool=${tool}, cwd=${cwd}, editorFormat=${editorFormat}`);
 
   cleanupStale(180);
 
@@ -429,9 +604,7 @@ export async function runPreToolUseHook(): Promise<void> {
     if (isContextstreamCall && normalizedContextstreamTool === "init") {
       clearInitRequired(cwd);
     } else {
-      const required = "mcp__contextstream__init(...)";
-      const msg = `First call required for this session: ${required}. Run it before any other MCP tool. Then call mcp__contextstream__context(user_message="...", save_exchange=true, session_id="<session-id>").`;
-      blockWithMessage(editorFormat, msg);
+      blockWithMessage(editorFormat, INIT_REQUIRED_MESSAGE);
     }
   }
 
@@ -448,119 +621,31 @@ export async function runPreToolUseHook(): Promise<void> {
     ) {
       // Narrow bypass: immediate read-only calls are allowed if context is fresh and unchanged.
     } else {
-      const msg =
-        'First call required for this prompt: mcp__contextstream__context(user_message="...", save_exchange=true, session_id="<session-id>"). Run it before any other MCP tool.';
-      blockWithMessage(editorFormat, msg);
+      blockWithMessage(editorFormat, CONTEXT_REQUIRED_MESSAGE);
     }
   }
 
+  // Decide on a redirect from the tool input alone; only then pay for the index lookup.
+  const redirect = getDiscoveryRedirect(tool, toolInput);
+  if (!redirect) {
+    allowTool(editorFormat, cwd, recordStateChange);
+  }
+
   // Check index status — only enforce search-first redirect when indexed and fresh.
   // Not indexed or stale: let all local tools through silently (matches Rust MCP behavior).
   const { isIndexed, isStale } = isProjectIndexed(cwd);
-  fs.appendFileSync(DEBUG_FILE, `[PreToolUse] isIndexed=${isIndexed}, isStale=${isStale}\n`);
+  debugLog(`[PreToolUse] isIndexed=${isIndexed}, isStale=${isStale}`);
   if (!isIndexed || isStale) {
     allowTool(editorFormat, cwd, recordStateChange);
   }
 
-  // Check tool and block if needed
-  if (tool === "Glob") {
-    const pattern = toolInput?.pattern || "";
-    fs.appendFileSync(DEBUG_FILE, `[PreToolUse] Glob pattern=${pattern}, isDiscovery=${isDiscoveryGlob(pattern)}\n`);
-    // Only intercept broad discovery patterns (e.g., **/*.ts, src/**)
-    if (isDiscoveryGlob(pattern)) {
-      const msg = `This project index is current. Use mcp__contextstream__search(mode="auto", query="${pattern}") instead of Glob for faster, richer code results.`;
-      fs.appendFileSync(DEBUG_FILE, `[PreToolUse] Intercepting discovery glob: ${msg}\n`);
-      if (editorFormat === "cline") {
-        outputClineBlock(msg, "[CONTEXTSTREAM] Use ContextStream search for code discovery.");
-      } else if (editorFormat === "cursor") {
-        outputCursorBlock(msg);
-      }
-      blockClaudeCode(msg);
-    }
-  } else if (tool === "Grep" || tool === "Search") {
-    const pattern = toolInput?.pattern || "";
-    const filePath = toolInput?.path || "";
-
-    if (pattern) {
-      if (filePath && !isDiscoveryGrep(filePath)) {
-        const msg = `STOP: Use Read("${filePath}") to view file content, or mcp__contextstream__search(mode="keyword", query="${pattern}") for codebase search.`;
-        if (editorFormat === "cline") {
-          outputClineBlock(msg, "[CONTEXTSTREAM] Use ContextStream search for code discovery.");
-        } else if (editorFormat === "cursor") {
-          outputCursorBlock(msg);
-        }
-        blockClaudeCode(msg);
-      } else {
-        const msg = `This project index is current. Use mcp__contextstream__search(mode="auto", query="${pattern}") instead of ${tool} for faster, richer code results.`;
-        if (editorFormat === "cline") {
-          outputClineBlock(msg, "[CONTEXTSTREAM] Use ContextStream search for code discovery.");
-        } else if (editorFormat === "cursor") {
-          outputCursorBlock(msg);
-        }
-        blockClaudeCode(msg);
-      }
-    }
-  } else if (tool === "Explore") {
-    const msg =
-      'Project index is current. Use mcp__contextstream__search(mode="auto", output_format="paths") instead of Explore for broad discovery.';
-    if (editorFormat === "cline") {
-      outputClineBlock(msg, "[CONTEXTSTREAM] Use ContextStream search for code discovery.");
-    } else if (editorFormat === "cursor") {
-      outputCursorBlock(msg);
-    }
-    blockClaudeCode(msg);
-  } else if (tool === "Task") {
-    const subagentTypeRaw =
-      (toolInput as { subagent_type?: string; subagentType?: string })?.subagent_type ||
-      (toolInput as { subagent_type?: string; subagentType?: string })?.subagentType ||
-      "";
-    const subagentType = subagentTypeRaw.toLowerCase();
-    if (subagentType.includes("explore")) {
-      const msg = 'Project index is current. Use mcp__contextstream__search(mode="auto") instead of Task(Explore) for broad discovery.';
-      if (editorFormat === "cline") {
-        outputClineBlock(msg, "[CONTEXTSTREAM] Use ContextStream search for code discovery.");
-      } else if (editorFormat === "cursor") {
-        outputCursorBlock(msg);
-      }
-      blockClaudeCode(msg);
-    }
-    if (subagentType.includes("plan")) {
-      const msg =
-        'For planning, use mcp__contextstream__search(mode="auto", output_format="paths") for discovery, then save your plan with mcp__contextstream__session(action="capture_plan"). Then create tasks with mcp__contextstream__memory(action="create_task", title="...", plan_id="...").';
-      if (editorFormat === "cline") {
-        outputClineBlock(msg, "[CONTEXTSTREAM] Use ContextStream plans for persistence.");
-      } else if (editorFormat === "cursor") {
-        outputCursorBlock(msg);
-      }
-      blockClaudeCode(msg);
-    }
-  } else if (tool === "EnterPlanMode") {
-    const msg =
-      'After finalizing your plan, save it to ContextStream (not a local markdown file): mcp__contextstream__session(action="capture_plan", title="...", steps=[...]). Then create tasks with mcp__contextstream__memory(action="create_task", title="...", plan_id="...").';
-    if (editorFormat === "cline") {
-      outputClineBlock(msg, "[CONTEXTSTREAM] Use ContextStream plans for persistence.");
-    } else if (editorFormat === "cursor") {
-      outputCursorBlock(msg);
-    }
-    blockClaudeCode(msg);
-  }
-
-  // Cline/Cursor specific tool names
-  if (tool === "list_files" || tool === "search_files") {
-    const pattern = toolInput?.path || (toolInput as { regex?: string })?.regex || "";
-    if (isDiscoveryGlob(pattern) || isDiscoveryGrep(pattern)) {
-      const msg = `Project index is current. Use mcp__contextstream__search(mode="auto", query="${pattern}") instead of ${tool} for faster, richer code results.`;
-      if (editorFormat === "cline") {
-        outputClineBlock(msg, "[CONTEXTSTREAM] Use ContextStream search for code discovery.");
-      } else if (editorFormat === "cursor") {
-        outputCursorBlock(msg);
-      }
-      blockClaudeCode(msg);
-    }
+  debugLog(`[PreToolUse] Redirecting ${tool}: ${redirect.message}`);
+  if (editorFormat === "cline") {
+    outputClineBlock(redirect.message, redirect.contextMod);
+  } else if (editorFormat === "cursor") {
+    outputCursorBlock(redirect.message);
   }
-
-  // Allow the tool
-  allowTool(editorFormat, cwd, recordStateChange);
+  blockClaudeCode(redirect.message);
 }
 
 // Auto-run if executed directly
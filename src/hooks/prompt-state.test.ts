@@ -80,6 +80,25 @@ describe("prompt-state", () => {
     expect(isContextRequired(parent)).toBe(false);
   });
 
+  it("sees another process's same-size rewrite within one timestamp tick", () => {
+    const cwd = "/tmp/cs-prompt-state-concurrent";
+    const tick = new Date(Math.floor(Date.now() / 1000) * 1000);
+    const writeEntry = (requireInit: boolean) => {
+      const entry = { require_context: false, require_init: requireInit, updated_at: "" };
+      // Pad so both versions have the same size, as a timestamp-only rewrite would.
+      const content = JSON.stringify({ workspaces: { [cwd]: entry } }).padEnd(128);
+      fs.writeFileSync(STATE_PATH, content, "utf8");
+      // Both writes land on the same timestamp tick.
+      fs.utimesSync(STATE_PATH, tick, tick);
+    };
+
+    writeEntry(true);
+    expect(isInitRequired(cwd)).toBe(true);
+
+    writeEntry(false);
+    expect(isInitRequired(cwd)).toBe(false);
+  });
+
   it("cleans up stale entries", () => {
     const stale = {
       workspaces: {
@@ -74,7 +74,7 @@ function writeState(state: PromptStateFile): void {
   }
 }
 
-function getOrCreateEntry(
+function findEntry(
   state: PromptStateFile,
   cwd: string
 ): { key: string; entry: PromptStateEntry } | null {
@@ -89,6 +89,18 @@ function getOrCreateEntry(
     }
   }
 
+  return null;
+}
+
+function getOrCreateEntry(
+  state: PromptStateFile,
+  cwd: string
+): { key: string; entry: PromptStateEntry } | null {
+  if (!cwd.trim()) return null;
+
+  const found = findEntry(state, cwd);
+  if (found) return found;
+
   const created: PromptStateEntry = {
     require_context: false,
     require_init: false,
@@ -148,7 +160,7 @@ export function clearContextRequired(cwd: string): void {
 export function isContextRequired(cwd: string): boolean {
   if (!cwd.trim()) return false;
   const state = readState();
-  const target = getOrCreateEntry(state, cwd);
+  const target = findEntry(state, cwd);
   return Boolean(target?.entry.require_context);
 }
 
@@ -175,7 +187,7 @@ export function clearInitRequired(cwd: string): void {
 export function isInitRequired(cwd: string): boolean {
   if (!cwd.trim()) return false;
   const state = readState();
-  const target = getOrCreateEntry(state, cwd);
+  const target = findEntry(state, cwd);
   return Boolean(target?.entry.require_init);
 }
 
@@ -192,7 +204,7 @@ export function markStateChanged(cwd: string): void {
 export function isContextFreshAndClean(cwd: string, maxAgeSeconds: number): boolean {
   if (!cwd.trim()) return false;
   const state = readState();
-  const target = getOrCreateEntry(state, cwd);
+  const target = findEntry(state, cwd);
   const entry = target?.entry;
   if (!entry?.last_context_at) return false;
 
@@ -244,7 +256,7 @@ export function clearIndexWaitWindow(cwd: string): void {
 export function indexWaitRemainingSeconds(cwd: string): number | null {
   if (!cwd.trim()) return null;
   const state = readState();
-  const target = getOrCreateEntry(state, cwd);
+  const target = findEntry(state, cwd);
   if (!target?.entry.index_wait_until) return null;
   const until = new Date(target.entry.index_wait_until).getTime();
   if (Number.isNaN(until)) return null;
@@ -1,15 +1,17 @@
 /**
  * Fast hook runner - single entry point for all hooks
- * Usage: contextstream-hook <hook-name> [args...]
+ * Usage: contextstream-hook [hook] <hook-name> [args...]
  *
  * This avoids the overhead of loading the full MCP server for hook execution.
+ * The optional "hook" prefix mirrors `contextstream-mcp hook <hook-name>` so
+ * installed commands look the same whichever entry point they use.
  *
  * IMPORTANT: Unknown hooks exit 0 (not 1) to avoid showing "hook error" in
  * editors when users have outdated hooks from a previous version. A silently
  * succeeding hook is far better UX than a broken error message.
  */
 
-const hookName = process.argv[2];
+const hookName = process.argv[2] === "hook" ? process.argv[3] : process.argv[2];
 
 if (!hookName) {
   // No hook name = likely misconfigured, but don't break the editor
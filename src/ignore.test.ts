@@ -2,7 +2,13 @@ import { describe, it, expect, beforeEach, afterEach } from "vitest";
 import * as fs from "fs";
 import * as path from "path";
 import * as os from "os";
-import { loadIgnorePatterns, loadIgnorePatternsSync, getSampleIgnoreContent } from "./ignore.js";
+import {
+  loadIgnorePatterns,
+  loadIgnorePatternsSync,
+  getSampleIgnoreContent,
+  isIgnored,
+  clearIgnoreCache,
+} from "./ignore.js";
 
 describe("ignore patterns", () => {
   let tempDir: string;
@@ -17,6 +23,13 @@ describe("ignore patterns", () => {
     fs.rmSync(tempDir, { recursive: true, force: true });
   });
 
+  // Write <tempDir>/.contextstream/ignore, creating the directory on first use.
+  function writeIgnoreFile(content: string): void {
+    const csDir = path.join(tempDir, ".contextstream");
+    fs.mkdirSync(csDir, { recursive: true });
+    fs.writeFileSync(path.join(csDir, "ignore"), content);
+  }
+
   describe("loadIgnorePatterns", () => {
     it("should load default patterns when no .contextstream/ignore exists", async () => {
       const ig = await loadIgnorePatterns(tempDir);
@@ -29,17 +42,11 @@ describe("ignore patterns", () => {
     });
 
     it("should load user patterns from .contextstream/ignore", async () => {
-      // Create .contextstream/ignore file
-      const csDir = path.join(tempDir, ".contextstream");
-      fs.mkdirSync(csDir);
-      fs.writeFileSync(
-        path.join(csDir, "ignore"),
-        `# Custom ignore rules
+      writeIgnoreFile(`# Custom ignore rules
 customer-data/
 *.secret
 src/legacy/
-`
-      );
+`);
 
       const ig = await loadIgnorePatterns(tempDir);
 
@@ -55,9 +62,7 @@ src/legacy/
     });
 
     it("should handle empty .contextstream/ignore file", async () => {
-      const csDir = path.join(tempDir, ".contextstream");
-      fs.mkdirSync(csDir);
-      fs.writeFileSync(path.join(csDir, "ignore"), "");
+      writeIgnoreFile("");
 
       const ig = await loadIgnorePatterns(tempDir);
 
@@ -67,22 +72,27 @@ src/legacy/
     });
 
     it("should ignore comments in .contextstream/ignore", async () => {
-      const csDir = path.join(tempDir, ".contextstream");
-      fs.mkdirSync(csDir);
-      fs.writeFileSync(
-        path.join(csDir, "ignore"),
-        `# This is a comment
+      writeIgnoreFile(`# This is a comment
 # Another comment
 secret.txt
 # More comments
-`
-      );
+`);
 
       const ig = await loadIgnorePatterns(tempDir);
 
       expect(ig.ignores("secret.txt")).toBe(true);
       expect(ig.ignores("# This is a comment")).toBe(false);
     });
+
+    it("should let user negations re-include default-ignored files", async () => {
+      writeIgnoreFile("!package-lock.json\n*.secret\n");
+
+      const ig = await loadIgnorePatterns(tempDir);
+
+      expect(ig.ignores("package-lock.json")).toBe(false);
+      expect(ig.ignores("config.secret")).toBe(true);
+      expect(ig.ignores("node_modules/foo.js")).toBe(true);
+    });
   });
 
   describe("loadIgnorePatternsSync", () => {
@@ -92,6 +102,34 @@ secret.txt
       expect(ig.hasUserPatterns).toBe(false);
       expect(ig.ignores("node_modules/foo.js")).toBe(true);
     });
+
+    it("should give each load its own default matcher", () => {
+      // Matchers memoize every path they check, so sharing one across loads
+      // would keep paths from every indexed project alive.
+      const first = loadIgnorePatternsSync(tempDir);
+      const second = loadIgnorePatternsSync(tempDir);
+
+      expect(first.ignores).not.toBe(second.ignores);
+      expect(first.ignores("dist/index.js")).toBe(true);
+      expect(second.ignores("dist/index.js")).toBe(true);
+    });
+  });
+
+  describe("isIgnored cache", () => {
+    afterEach(() => {
+      clearIgnoreCache();
+    });
+
+    it("should reload patterns when .contextstream/ignore changes", async () => {
+      writeIgnoreFile("secret.txt\n");
+
+      expect(await isIgnored(tempDir, "secret.txt")).toBe(true);
+      expect(await isIgnored(tempDir, "private.txt")).toBe(false);
+
+      writeIgnoreFile("secret.txt\nprivate.txt\n");
+
+      expect(await isIgnored(tempDir, "private.txt")).toBe(true);
+    });
   });
 
   describe("default ignore patterns", () => {
@@ -110,6 +148,15 @@ secret.txt
       expect(ig.ignores("vendor/autoload.php")).toBe(true);
     });
 
+    it("should ignore default directories at any depth", async () => {
+      const ig = await loadIgnorePatterns(tempDir);
+
+      expect(ig.ignores("packages/app/node_modules/react/index.js")).toBe(true);
+      expect(ig.ignores("services/api/.venv/")).toBe(true);
+      expect(ig.ignores("src/node_modules.ts")).toBe(false);
+      expect(ig.ignores("src/dist")).toBe(false);
+    });
+
     it("should ignore build output directories", async () => {
       const ig = await loadIgnorePatterns(tempDir);
 
@@ -13,7 +13,7 @@
 
 import * as fs from "fs";
 import * as path from "path";
-import ignore, { Ignore } from "ignore";
+import ignore from "ignore";
 
 const IGNORE_FILENAME = ".contextstream/ignore";
 
@@ -98,6 +98,73 @@ export interface IgnoreInstance {
   hasUserPatterns: boolean;
 }
 
+/**
+ * Directory names from the default "name/" patterns, for a set lookup per path
+ * component before falling back to the full matcher.
+ */
+const DEFAULT_IGNORE_DIR_NAMES = new Set(
+  DEFAULT_IGNORE_PATTERNS.filter((p) => p.endsWith("/")).map((p) => p.slice(0, -1))
+);
+
+function hasDefaultIgnoredDir(pathname: string): boolean {
+  const parts = pathname.split("/");
+  // The last component is a file name unless the path ends with "/" (then it is "").
+  for (let i = 0; i < parts.length - 1; i++) {
+    if (DEFAULT_IGNORE_DIR_NAMES.has(parts[i])) return true;
+  }
+  return false;
+}
+
+/**
+ * Build a matcher for the default patterns. Each load gets its own instance:
+ * the ignore package memoizes per-path results on the instance, so a shared one
+ * would keep every path ever checked alive for the life of the server.
+ */
+function buildDefaultMatcher(): (pathname: string) => boolean {
+  const defaultIgnore = ignore().add(DEFAULT_IGNORE_PATTERNS);
+  return (pathname: string) => hasDefaultIgnoredDir(pathname) || defaultIgnore.ignores(pathname);
+}
+
+function parseUserPatterns(content: string): string[] {
+  return content
+    .split("\n")
+    .map((line) => line.trim())
+    .filter((line) => line && !line.startsWith("#")); // Skip empty lines and comments
+}
+
+function buildIgnoreInstance(userPatterns: string[]): IgnoreInstance {
+  const patterns = [...DEFAULT_IGNORE_PATTERNS, ...userPatterns];
+
+  if (userPatterns.length === 0) {
+    return {
+      ignores: buildDefaultMatcher(),
+      patterns,
+      hasUserPatterns: false,
+    };
+  }
+
+  // A negation (!pattern) can re-include a path the defaults exclude, which only
+  // works when defaults and user rules are evaluated as one ordered list.
+  if (userPatterns.some((line) => line.startsWith("!"))) {
+    const ig = ignore().add(DEFAULT_IGNORE_PATTERNS).add(userPatterns);
+    return {
+      ignores: (pathname: string) => ig.ignores(pathname),
+      patterns,
+      hasUserPatterns: true,
+    };
+  }
+
+  // Without negations a path is ignored if either set matches, so check the
+  // defaults (with the directory-name fast path) first.
+  const isDefaultIgnored = buildDefaultMatcher();
+  const userIgnore = ignore().add(userPatterns);
+  return {
+    ignores: (pathname: string) => isDefaultIgnored(pathname) || userIgnore.ignores(pathname),
+    patterns,
+    hasUserPatterns: true,
+  };
+}
+
 /**
  * Load ignore patterns from a project directory.
  *
@@ -108,95 +175,73 @@ export interface IgnoreInstance {
  * @returns An IgnoreInstance with ignores() method
  */
 export async function loadIgnorePatterns(projectRoot: string): Promise<IgnoreInstance> {
-  const ig = ignore();
-  const patterns: string[] = [...DEFAULT_IGNORE_PATTERNS];
-
-  // Add default patterns first
-  ig.add(DEFAULT_IGNORE_PATTERNS);
-
-  // Try to load user patterns
-  const ignoreFilePath = path.join(projectRoot, IGNORE_FILENAME);
-  let hasUserPatterns = false;
+  let userPatterns: string[] = [];
 
   try {
-    const content = await fs.promises.readFile(ignoreFilePath, "utf-8");
-    const userPatterns = content
-      .split("\n")
-      .map((line) => line.trim())
-      .filter((line) => line && !line.startsWith("#")); // Skip empty lines and comments
-
-    if (userPatterns.length > 0) {
-      ig.add(userPatterns);
-      patterns.push(...userPatterns);
-      hasUserPatterns = true;
-    }
+    const content = await fs.promises.readFile(path.join(projectRoot, IGNORE_FILENAME), "utf-8");
+    userPatterns = parseUserPatterns(content);
   } catch {
     // No ignore file found, use defaults only
   }
 
-  return {
-    ignores: (pathname: string) => ig.ignores(pathname),
-    patterns,
-    hasUserPatterns,
-  };
+  return buildIgnoreInstance(userPatterns);
 }
 
 /**
  * Synchronous version of loadIgnorePatterns for use in contexts where async isn't available.
  */
 export function loadIgnorePatternsSync(projectRoot: string): IgnoreInstance {
-  const ig = ignore();
-  const patterns: string[] = [...DEFAULT_IGNORE_PATTERNS];
-
-  // Add default patterns first
-  ig.add(DEFAULT_IGNORE_PATTERNS);
-
-  // Try to load user patterns
-  const ignoreFilePath = path.join(projectRoot, IGNORE_FILENAME);
-  let hasUserPatterns = false;
+  let userPatterns: string[] = [];
 
   try {
-    const content = fs.readFileSync(ignoreFilePath, "utf-8");
-    const userPatterns = content
-      .split("\n")
-      .map((line) => line.trim())
-      .filter((line) => line && !line.startsWith("#"));
-
-    if (userPatterns.length > 0) {
-      ig.add(userPatterns);
-      patterns.push(...userPatterns);
-      hasUserPatterns = true;
-    }
+    const content = fs.readFileSync(path.join(projectRoot, IGNORE_FILENAME), "utf-8");
+    userPatterns = parseUserPatterns(content);
   } catch {
     // No ignore file found, use defaults only
   }
 
-  return {
-    ignores: (pathname: string) => ig.ignores(pathname),
-    patterns,
-    hasUserPatterns,
-  };
+  return buildIgnoreInstance(userPatterns);
+}
+
+/**
+ * Compiled ignore instances keyed by project root.
+ *
+ * Each entry remembers the mtime/size of .contextstream/ignore it was built from,
+ * so the compiled matcher is reused until the file actually changes.
+ */
+interface CachedIgnore {
+  signature: string;
+  instance: IgnoreInstance;
+}
+
+const ignoreCache = new Map<string, CachedIgnore>();
+
+function ignoreFileSignature(stat: fs.Stats | null): string {
+  return stat ? `${stat.mtimeMs}:${stat.size}` : "none";
 }
 
 /**
  * Check if a path should be ignored using cached patterns.
  *
  * This is a convenience function that loads patterns on first call
- * and caches them for subsequent calls.
+ * and caches them until .contextstream/ignore changes.
  */
-const ignoreCache = new Map<string, IgnoreInstance>();
-
 export async function isIgnored(projectRoot: string, pathname: string): Promise<boolean> {
-  let ig = ignoreCache.get(projectRoot);
-  if (!ig) {
-    ig = await loadIgnorePatterns(projectRoot);
-    ignoreCache.set(projectRoot, ig);
+  const stat = await fs.promises.stat(path.join(projectRoot, IGNORE_FILENAME)).catch(() => null);
+  const signature = ignoreFileSignature(stat);
+
+  const cached = ignoreCache.get(projectRoot);
+  if (cached && cached.signature === signature) {
+    return cached.instance.ignores(pathname);
   }
-  return ig.ignores(pathname);
+
+  const instance = await loadIgnorePatterns(projectRoot);
+  ignoreCache.set(projectRoot, { signature, instance });
+  return instance.ignores(pathname);
 }
 
 /**
- * Clear the ignore cache (useful if .contextstream/ignore changes)
+ * Clear the ignore cache (useful to force a reload regardless of file mtime)
  */
 export function clearIgnoreCache(projectRoot?: string): void {
   if (projectRoot) {